@@ -6,19 +6,40 @@ A menu bar app that lets you register Terminal.app windows and quickly
 bring them to focus. Terminals send events via HTTP to this app, which
 displays them in the macOS system menu bar.
 
-Events: { window_id, event_title, event_msg }
+Events: { window_id, event_title, event_msg }, POSTed form-encoded
+(window_id=...&event_title=...&event_msg=...) or as a JSON object.
 Special event_title "terminate" removes the session from the list.
 """
 
 import argparse
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
+import os
+import selectors
+import socket
 import subprocess
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http import HTTPStatus
+from types import MappingProxyType
+from urllib.parse import parse_qsl
 
 import rumps
 import objc
 from AppKit import NSAttributedString, NSFont, NSFontManager
+from PyObjCTools import AppHelper
+
+try:
+    from Foundation import NSAppleEventDescriptor, NSAppleScript
+except ImportError:  # no in-process AppleScript; clicks spawn osascript instead
+    NSAppleEventDescriptor = NSAppleScript = None
+
+try:
+    import orjson  # optional: SIMD-accelerated JSON for the request hot path
+except ImportError:
+    orjson = None
 
 
 # ---------------------------------------------------------------------------
@@ -27,131 +48,568 @@ from AppKit import NSAttributedString, NSFont, NSFontManager
 HTTP_PORT = 9876
 ICON_NORMAL = "🖥"
 ICON_UNSEEN = "⚡"
+MENU_PLACEHOLDER = "No active terminals"
+MENU_SEPARATOR_KEY = "—separator—"
+REFRESH_DEBOUNCE = 0.03  # seconds; bursts of events inside this window share one rebuild
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+MAX_HEADER_BYTES = 64 * 1024  # request heads larger than this are dropped
+MAX_BODY_BYTES = 64 * 1024  # larger bodies are rejected (413) before any is buffered
+RECV_BUFFER_BYTES = 4096  # per-connection receive buffer; holds any normal event
+KEEP_ALIVE_TIMEOUT = 30  # seconds an idle keep-alive connection is held open
+SCRIPT_CACHE_DIR = os.path.expanduser("~/Library/Caches/termtap")
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    # keep catching the stdlib exception either way.
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 
 # ---------------------------------------------------------------------------
-# Session store (thread-safe)
+# Session store (thread-safe, lock-free)
 # ---------------------------------------------------------------------------
+class SessionInfo(tuple):
+    """Read-only (event_title, event_msg, unseen) record, also indexable by field name."""
+
+    __slots__ = ()
+    _FIELDS = {"event_title": 0, "event_msg": 1, "unseen": 2}
+
+    def __getitem__(self, key):
+        if type(key) is str:
+            key = self._FIELDS[key]
+        return tuple.__getitem__(self, key)
+
+
 class SessionStore:
-    """Thread-safe store for terminal sessions."""
+    """
+    Thread-safe store for terminal sessions, without locks.
+
+    Writers are the HTTP loop thread (upsert/remove) and the main thread
+    (mark_all_seen). Every method touches shared state only through single
+    dict operations (item store, pop, copy) or plain attribute assignments,
+    each of which is atomic under the CPython GIL.
+
+    Seen state is tracked with epochs: each upsert stamps its session with
+    a fresh, increasing epoch, and a session is unseen while its epoch is
+    above _seen_epoch. mark_all_seen is then a single assignment that never
+    touches session entries, so it cannot race with (and lose) an upsert.
+
+    Fields are kept as parallel columns keyed by window_id rather than one
+    record per session; _titles doubles as the set of live sessions.
+    """
 
     def __init__(self):
-        self._lock = threading.Lock()
-        self._sessions = {}  # window_id -> {event_title, event_msg, unseen}
-
-    def upsert(self, window_id: str, event_title: str, event_msg: str):
-        """Register or update a terminal session."""
-        with self._lock:
-            self._sessions[window_id] = {
-                "event_title": event_title,
-                "event_msg": event_msg,
-                "unseen": True,
-            }
-
-    def remove(self, window_id: str):
-        """Remove a terminal session."""
-        with self._lock:
-            self._sessions.pop(window_id, None)
+        self._titles = {}  # window_id -> event_title (defines membership)
+        self._msgs = {}  # window_id -> event_msg
+        self._epochs = {}  # window_id -> epoch of its latest upsert
+        self._versions = itertools.count(1)  # next() is atomic: unique per mutation
+        self._version = 0  # also the epoch source: upserts stamp with it
+        self._max_epoch = 0  # newest epoch among live sessions
+        self._seen_epoch = 0  # sessions at or below this epoch have been seen
+        self._snapshot = None  # (version, read-only view) built by get_all()
+
+    def upsert(self, window_id: int, event_title: str, event_msg: str) -> bool:
+        """Register or update a terminal session; return False if nothing changed."""
+        # A resend of what is already shown as unseen changes nothing visible
+        if (
+            self._epochs.get(window_id, 0) > self._seen_epoch
+            and self._titles.get(window_id) == event_title
+            and self._msgs.get(window_id) == event_msg
+        ):
+            return False
+
+        epoch = next(self._versions)
+        # msg before title: anyone who sees the title can also find a msg
+        self._msgs[window_id] = event_msg
+        self._titles[window_id] = event_title
+        self._epochs[window_id] = epoch
+        self._max_epoch = epoch
+        self._version = epoch
+        return True
+
+    def remove(self, window_id: int) -> bool:
+        """Remove a terminal session; return False if it wasn't registered."""
+        if self._titles.pop(window_id, None) is None:
+            return False
+        self._msgs.pop(window_id, None)
+        epoch = self._epochs.pop(window_id, 0)
+        if epoch == self._max_epoch:
+            # The newest session went away; only now is a scan needed
+            self._max_epoch = max(self._epochs.copy().values(), default=0)
+        self._version = next(self._versions)
+        return True
 
     def mark_all_seen(self):
         """Mark all sessions as seen."""
-        with self._lock:
-            for session in self._sessions.values():
-                session["unseen"] = False
+        max_epoch = self._max_epoch
+        if max_epoch > self._seen_epoch:
+            self._seen_epoch = max_epoch
+            self._version = next(self._versions)
+
+    def version(self):
+        """Return a counter that changes whenever the sessions change."""
+        return self._version
 
     def get_all(self):
-        """Return a deep snapshot of all sessions."""
-        with self._lock:
-            return {k: dict(v) for k, v in self._sessions.items()}
+        """Return a read-only snapshot of all sessions, reused until the next change."""
+        # Read the version first: if a write lands mid-build the snapshot is
+        # newer than its tag, and the next call simply rebuilds it.
+        version = self._version
+        cached = self._snapshot
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # Only the membership column is iterated, so only it needs a copy;
+        # single .get() lookups on the live columns are atomic on their own
+        seen_epoch = self._seen_epoch
+        msgs = self._msgs
+        epochs = self._epochs
+        view = MappingProxyType({
+            wid: SessionInfo((title, msgs.get(wid, ""), epochs.get(wid, 0) > seen_epoch))
+            for wid, title in self._titles.copy().items()
+        })
+        self._snapshot = (version, view)
+        return view
 
     def has_unseen(self):
         """Check if any session has unseen updates."""
-        with self._lock:
-            return any(s["unseen"] for s in self._sessions.values())
+        return self._max_epoch > self._seen_epoch
 
     def count(self):
         """Return the number of active sessions."""
-        with self._lock:
-            return len(self._sessions)
+        return len(self._titles)
 
 
 # ---------------------------------------------------------------------------
-# HTTP request handler
+# Event handler
 # ---------------------------------------------------------------------------
-class EventHandler(BaseHTTPRequestHandler):
-    """Handles incoming events from terminal sessions."""
+class EventHandler:
+    """Shared state for incoming events from terminal sessions."""
 
     store: SessionStore = None  # set before server starts
     app_ref = None  # reference to the rumps app for menu refresh
 
-    def do_POST(self):
-        try:
-            content_length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
 
-            window_id = str(data.get("window_id", "")).strip()
-            event_title = str(data.get("event_title", "")).strip()
-            event_msg = str(data.get("event_msg", "")).strip()
+def handle_event(
+    body: bytes, content_type: str, store: SessionStore, app_ref=None, keep_alive: bool = False,
+) -> bytes:
+    """
+    Apply a single POSTed event body and return the complete HTTP response.
 
-            if not window_id or not event_title:
-                self._respond(400, {"error": "window_id and event_title are required"})
-                return
+    This is the whole per-request hot path (parse, validate, update the
+    store, serialize) as one plain function, independent of the transport.
+    """
+    status_code, payload = _apply_event(body, content_type, store, app_ref)
+    return _http_response(status_code, payload, keep_alive)
 
-            # Validate window_id is numeric (for AppleScript safety)
-            if not window_id.isdigit():
-                self._respond(400, {"error": "window_id must be a numeric value"})
-                return
 
-            if event_title.lower() == "terminate":
-                self.store.remove(window_id)
-                self._respond(200, {"status": "removed", "window_id": window_id})
+# Response bodies for the hot path, serialized once. window_id is a validated
+# int by the time it is formatted in, so the templates need no JSON escaping.
+_REGISTERED_BODY = b'{"status":"registered","window_id":"%d"}'
+_REMOVED_BODY = b'{"status":"removed","window_id":"%d"}'
+_MISSING_FIELDS_BODY = _json_dumps({"error": "window_id and event_title are required"})
+_BAD_WINDOW_ID_BODY = _json_dumps({"error": "window_id must be a numeric value"})
+_INVALID_JSON_BODY = _json_dumps({"error": "Invalid JSON"})
+_INVALID_FORM_BODY = _json_dumps({"error": "Invalid form body"})
+
+
+def _apply_event(body: bytes, content_type: str, store: SessionStore, app_ref=None):
+    """Parse, validate and apply an event body; return (status_code, JSON payload bytes)."""
+    try:
+        if content_type.split(";", 1)[0].strip().lower() == FORM_CONTENT_TYPE:
+            # Fixed three-field shape: no tokenizer needed, just split on & and =
+            data = dict(parse_qsl(body.decode("ascii"), keep_blank_values=True))
+        else:
+            data = _json_loads(body)
+
+        raw_window_id = data.get("window_id")
+        event_title = str(data.get("event_title", "")).strip()
+        event_msg = str(data.get("event_msg", "")).strip()
+
+        if raw_window_id in (None, "") or not event_title:
+            return 400, _MISSING_FIELDS_BODY
+
+        # window_id must be a non-negative integer (for AppleScript safety);
+        # int keys also hash faster than strings in the store. Only real ints
+        # and digit strings qualify: int() would truncate floats, accept bools
+        # and allow "1_000".
+        window_id = -1
+        if type(raw_window_id) is int:
+            window_id = raw_window_id
+        elif isinstance(raw_window_id, str):
+            digits = raw_window_id.strip()
+            # Terminal window ids are 32-bit: ten digits is plenty, and longer
+            # strings could hit int()'s digit limit (ValueError -> 500)
+            if len(digits) <= 10 and digits.isascii() and digits.isdigit():
+                window_id = int(digits)
+        if window_id < 0:
+            return 400, _BAD_WINDOW_ID_BODY
+
+        if event_title.lower() == "terminate":
+            changed = store.remove(window_id)
+            payload = _REMOVED_BODY % window_id
+        else:
+            changed = store.upsert(window_id, event_title, event_msg)
+            payload = _REGISTERED_BODY % window_id
+
+        # Trigger menu refresh on the main thread (skipped for no-op events)
+        if changed and app_ref:
+            app_ref.schedule_refresh()
+
+        return 200, payload
+
+    except json.JSONDecodeError:
+        return 400, _INVALID_JSON_BODY
+    except UnicodeDecodeError:
+        return 400, _INVALID_FORM_BODY
+    except Exception as e:
+        return 500, _json_dumps({"error": str(e)})
+
+
+# ---------------------------------------------------------------------------
+# HTTP server (asyncio, single selector loop)
+# ---------------------------------------------------------------------------
+class EventServer:
+    """
+    Minimal HTTP/1.1 server that feeds POSTed events to EventHandler.
+
+    All connections are multiplexed on one selector event loop (kqueue on
+    macOS, epoll on Linux) through readiness callbacks, so a burst of events
+    from many terminals costs neither a thread nor a coroutine per request.
+    """
+
+    def __init__(self, server_address):
+        # Bind eagerly so port conflicts surface in the caller, like HTTPServer
+        self.socket = socket.create_server(server_address)
+        self.server_address = self.socket.getsockname()[:2]
+        self._loop = None
+        self._stop = None
+        self._connections = set()  # open transports, closed on shutdown
+        self._running = threading.Event()
+        self._stopped = threading.Event()
+
+    def serve_forever(self):
+        """Run the event loop until shutdown() is called (blocks)."""
+        loop = asyncio.SelectorEventLoop(selectors.DefaultSelector())
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            loop.close()
+            self._stopped.set()
+
+    def shutdown(self):
+        """Stop serve_forever() from another thread and wait for it to exit."""
+        self._running.wait()
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._stopped.wait()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await self._loop.create_server(
+            lambda: _EventProtocol(self._connections), sock=self.socket,
+        )
+        self._running.set()
+        async with server:
+            await self._stop.wait()
+            # Idle keep-alive connections would otherwise hold up server close
+            for transport in list(self._connections):
+                transport.close()
+
+
+class _EventProtocol(asyncio.BufferedProtocol):
+    """
+    Per-connection request parser over a preallocated receive buffer.
+
+    The transport reads straight into self._buffer, so steady-state traffic
+    allocates no per-read bytes objects. Connections stay open for further
+    requests (HTTP/1.1 keep-alive) unless the client asks to close.
+    """
+
+    def __init__(self, connections):
+        self._connections = connections
+        self._transport = None
+        self._buffer = bytearray(RECV_BUFFER_BYTES)
+        self._start = 0  # first unconsumed byte in _buffer
+        self._end = 0  # end of received data in _buffer
+        self._request = None  # (content_length, content_type, keep_alive) once the head is in
+        self._idle_timer = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self._connections.add(transport)
+        self._reset_idle_timer()
+
+    def connection_lost(self, exc):
+        self._connections.discard(self._transport)
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+
+    def get_buffer(self, sizehint):
+        # The transport holds no view of the buffer between reads, so this is
+        # the only safe place to compact it or (for oversized requests) grow it.
+        buf = self._buffer
+        if self._start:
+            pending = self._end - self._start
+            buf[:pending] = buf[self._start:self._end]
+            self._start, self._end = 0, pending
+        if self._end == len(buf):
+            buf.extend(bytes(len(buf)))
+        return memoryview(buf)[self._end:]
+
+    def buffer_updated(self, nbytes):
+        self._end += nbytes
+        while not self._transport.is_closing() and self._handle_request():
+            pass
+
+    def _handle_request(self) -> bool:
+        """Answer one buffered request; return False once more data is needed."""
+        buf = self._buffer
+
+        if self._request is None:
+            end = buf.find(b"\r\n\r\n", self._start, self._end)
+            if end < 0:
+                if self._end - self._start > MAX_HEADER_BYTES:
+                    self._transport.close()  # malformed request; drop it
+                return False
+            method, version, headers = _parse_head(bytes(buf[self._start:end]))
+            self._start = end + 4
+
+            # Error replies close the connection: any body they had is left unread
+            if method != "POST":
+                self._reply(_format_response(501, {"error": f"Unsupported method ({method})"}), False)
+                return False
+            # Only Content-Length framing is understood; reading a chunked body
+            # as empty would parse its chunks as the next pipelined request
+            if "transfer-encoding" in headers:
+                self._reply(_format_response(501, {"error": "Transfer-Encoding is not supported"}), False)
+                return False
+            expect = headers.get("expect")
+            if expect is not None and expect.lower() != "100-continue":
+                self._reply(_format_response(417, {"error": f"Unsupported expectation ({expect})"}), False)
+                return False
+            try:
+                content_length = int(headers.get("content-length", 0))
+            except ValueError:
+                content_length = -1
+            if content_length < 0:
+                self._reply(_format_response(400, {"error": "Invalid Content-Length"}), False)
+                return False
+            if content_length > MAX_BODY_BYTES:
+                self._reply(_format_response(413, {"error": "Event body too large"}), False)
+                return False
+
+            connection = headers.get("connection", "").lower()
+            if version == "HTTP/1.1":
+                keep_alive = "close" not in connection
             else:
-                self.store.upsert(window_id, event_title, event_msg)
-                self._respond(200, {"status": "registered", "window_id": window_id})
-
-            # Trigger menu refresh on the main thread
-            if self.app_ref:
-                self.app_ref.schedule_refresh()
-
-        except json.JSONDecodeError:
-            self._respond(400, {"error": "Invalid JSON"})
-        except Exception as e:
-            self._respond(500, {"error": str(e)})
-
-    def _respond(self, status_code, body):
-        self.send_response(status_code)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
-
-    def log_message(self, format, *args):
-        # Suppress default logging to stderr
-        pass
+                keep_alive = "keep-alive" in connection
+            self._request = (content_length, headers.get("content-type", "application/json"), keep_alive)
+            # The client holds the body back until told to go ahead (HTTP/1.0
+            # clients don't know the interim response and must not receive it)
+            if (
+                expect is not None
+                and version == "HTTP/1.1"
+                and self._end - self._start < content_length
+            ):
+                self._transport.write(_CONTINUE_RESPONSE)
+
+        content_length, content_type, keep_alive = self._request
+        body_end = self._start + content_length
+        if self._end < body_end:
+            return False  # wait for the rest of the body
+        body = bytes(buf[self._start:body_end])
+        self._start = body_end
+        self._request = None
+
+        self._reply(
+            handle_event(body, content_type, EventHandler.store, EventHandler.app_ref, keep_alive),
+            keep_alive,
+        )
+        return keep_alive
+
+    def _reply(self, response: bytes, keep_alive: bool):
+        self._transport.write(response)
+        if keep_alive:
+            self._reset_idle_timer()
+        else:
+            self._transport.close()
+
+    def _reset_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._idle_timer = loop.call_later(KEEP_ALIVE_TIMEOUT, self._transport.close)
+
+
+def _parse_head(head: bytes):
+    """Split a request head into (method, http_version, {lower-cased header name: value})."""
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    parts = request_line.split(" ")
+    method = parts[0]
+    version = parts[2] if len(parts) > 2 else "HTTP/1.0"
+
+    headers = {}
+    for line in header_lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method, version, headers
+
+
+def _response_prefix(status_code, keep_alive) -> bytes:
+    """Status line and fixed headers, up to (not including) the Content-Length value."""
+    return (
+        f"HTTP/1.1 {status_code} {HTTPStatus(status_code).phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "Content-Length: "
+    ).encode("latin-1")
+
+
+# Interim reply to "Expect: 100-continue"; the final response follows the body
+_CONTINUE_RESPONSE = b"HTTP/1.1 100 Continue\r\n\r\n"
+
+# Prebuilt once; only the body length and body vary per response
+_RESPONSE_PREFIXES = {
+    (code, keep_alive): _response_prefix(code, keep_alive)
+    for code in (200, 400, 413, 417, 500, 501)
+    for keep_alive in (False, True)
+}
+
+
+def _format_response(status_code, body, keep_alive=False):
+    """Serialize a JSON response as one buffer, ready for a single write."""
+    return _http_response(status_code, _json_dumps(body), keep_alive)
+
+
+def _http_response(status_code, payload: bytes, keep_alive=False):
+    """Frame an already-serialized JSON payload as one buffer, ready for a single write."""
+    prefix = (
+        _RESPONSE_PREFIXES.get((status_code, keep_alive))
+        or _response_prefix(status_code, keep_alive)
+    )
+    return b"".join((prefix, str(len(payload)).encode(), b"\r\n\r\n", payload))
 
 
 # ---------------------------------------------------------------------------
 # AppleScript helpers
 # ---------------------------------------------------------------------------
-def focus_terminal_window(window_id: str):
-    """Bring a specific Terminal.app window to the front using AppleScript."""
-    script = f'''
+# Focus logic as a named handler, so it can be called in-process with the
+# window id as a parameter; the run handler serves osascript/osacompile use.
+FOCUS_SCRIPT_SOURCE = """\
+on run argv
+    focus_window((item 1 of argv) as integer)
+end run
+
+on focus_window(targetId)
+    -- Same 5 s bound as the osascript fallback: in-process this runs on the
+    -- main thread, and a hung Terminal must not freeze the menu bar for the
+    -- default two-minute Apple event timeout
+    with timeout of 5 seconds
         tell application "Terminal"
             activate
-            set targetWindow to missing value
-            repeat with w in windows
-                if id of w is {window_id} then
-                    set targetWindow to w
-                    exit repeat
-                end if
-            end repeat
-            if targetWindow is not missing value then
-                set index of targetWindow to 1
-            end if
+            if (exists window id targetId) then set index of window id targetId to 1
         end tell
-    '''
+    end timeout
+end focus_window
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_focus_script():
+    """
+    Compile FOCUS_SCRIPT_SOURCE to a .scpt once and return its path.
+
+    The file name carries a hash of the source, so a changed script is never
+    served from a stale cache. Returns None if the script can't be compiled.
+    """
+    digest = hashlib.sha1(FOCUS_SCRIPT_SOURCE.encode()).hexdigest()[:12]
+    path = os.path.join(SCRIPT_CACHE_DIR, f"focus-{digest}.scpt")
+    if os.path.exists(path):
+        return path
     try:
-        subprocess.run(["osascript", "-e", script], capture_output=True, timeout=5)
+        os.makedirs(SCRIPT_CACHE_DIR, exist_ok=True)
+        result = subprocess.run(
+            ["osacompile", "-o", path, "-e", FOCUS_SCRIPT_SOURCE],
+            capture_output=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0 or not os.path.exists(path):
+        return None
+    return path
+
+
+def _fourcc(code: str) -> int:
+    """Apple event four-character code as an integer."""
+    return int.from_bytes(code.encode("ascii"), "big")
+
+
+class FocusScript:
+    """
+    FOCUS_SCRIPT_SOURCE compiled once with NSAppleScript and run in-process.
+
+    Each focus sends a subroutine Apple event calling focus_window(id), so
+    there is no osascript to spawn and nothing to recompile per click.
+    NSAppleScript is main-thread only, which is where menu clicks run.
+    """
+
+    def __init__(self):
+        self._script = NSAppleScript.alloc().initWithSource_(FOCUS_SCRIPT_SOURCE)
+        ok, error = self._script.compileAndReturnError_(None)
+        if not ok:
+            raise RuntimeError(f"Could not compile focus script: {error}")
+
+    def focus(self, window_id: int) -> bool:
+        """Call focus_window(window_id); return False if the script failed to run."""
+        if window_id > 0x7FFFFFFF:
+            return False  # doesn't fit the int32 descriptor
+
+        params = NSAppleEventDescriptor.listDescriptor()
+        params.insertDescriptor_atIndex_(NSAppleEventDescriptor.descriptorWithInt32_(window_id), 1)
+
+        event = NSAppleEventDescriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+            _fourcc("ascr"),  # kASAppleScriptSuite
+            _fourcc("psbr"),  # kASSubroutineEvent
+            NSAppleEventDescriptor.currentProcessDescriptor(),
+            -1,  # kAutoGenerateReturnID
+            0,  # kAnyTransactionID
+        )
+        event.setParamDescriptor_forKeyword_(
+            NSAppleEventDescriptor.descriptorWithString_("focus_window"),
+            _fourcc("snam"),  # keyASSubroutineName
+        )
+        event.setParamDescriptor_forKeyword_(params, _fourcc("----"))  # keyDirectObject
+
+        _, error = self._script.executeAppleEvent_error_(event, None)
+        return error is None
+
+
+def focus_terminal_window(window_id: int, script: FocusScript = None):
+    """
+    Bring a specific Terminal.app window to the front using AppleScript.
+
+    Runs in-process through ``script`` when given, falling back to a
+    one-shot osascript (running the precompiled script when available) if
+    there is none or it fails.
+    """
+    if script is not None and script.focus(window_id):
+        return
+
+    script_path = compiled_focus_script()
+    if script_path is not None:
+        args = ["osascript", script_path, str(window_id)]
+    else:
+        args = ["osascript", "-e", FOCUS_SCRIPT_SOURCE, str(window_id)]
+    try:
+        subprocess.run(args, capture_output=True, timeout=5)
     except (subprocess.TimeoutExpired, Exception):
         pass
 
@@ -159,6 +617,22 @@ def focus_terminal_window(window_id: str):
 # ---------------------------------------------------------------------------
 # Menu bar app
 # ---------------------------------------------------------------------------
+def _menu_key(window_id) -> str:
+    """Stable rumps menu key for a session's item (independent of its title)."""
+    return f"session:{window_id}"
+
+
+def _session_label(info) -> str:
+    """Menu label for a session snapshot."""
+    label = f"{info['event_title']}"
+    if info["event_msg"]:
+        label += f" — {info['event_msg']}"
+
+    if info["unseen"]:
+        label = f"● {label}"
+    return label
+
+
 class TerminalFocusApp(rumps.App):
     """macOS menu bar app for terminal session management."""
 
@@ -166,23 +640,46 @@ class TerminalFocusApp(rumps.App):
         super().__init__("0", quit_button=None)
         self.store = store
         self._refresh_lock = threading.Lock()
-        self._dirty = threading.Event()  # signals that a refresh is needed
-        self._session_keys = []  # track current menu item keys for cleanup
+        self._pending_lock = threading.Lock()
+        self._refresh_pending = False  # a debounced rebuild is already queued
+        self._items = {}  # window_id -> rumps.MenuItem currently in the menu
+        self._wid_by_item_id = {}  # id(MenuItem) -> window_id, for the shared click handler
+        self._rendered_version = None  # store version the menu currently reflects
+        self._focus_script = None  # in-process AppleScript; None -> spawn osascript
+        if NSAppleScript is not None:
+            try:
+                self._focus_script = FocusScript()
+            except RuntimeError as e:
+                print(f"Warning: {e}")
+
+        # Static skeleton; session items are inserted above the separator
+        self.menu.add(rumps.MenuItem(MENU_PLACEHOLDER))
+        self.menu[MENU_SEPARATOR_KEY] = rumps.separator
+        self.menu.add(rumps.MenuItem("Quit", callback=self._quit))
 
     def schedule_refresh(self):
-        """Signal that a menu refresh is needed (called from HTTP thread)."""
-        self._dirty.set()
+        """Queue a debounced menu rebuild on the main run loop (called from the HTTP thread)."""
+        with self._pending_lock:
+            if self._refresh_pending:
+                return
+            self._refresh_pending = True
+        AppHelper.callLater(REFRESH_DEBOUNCE, self._do_rebuild)
 
-    @rumps.timer(0.5)
-    def _poll_for_updates(self, timer):
-        """Polling timer on the main thread — checks if a refresh is needed."""
-        if self._dirty.is_set():
-            self._dirty.clear()
-            self._rebuild_menu()
+    def _do_rebuild(self):
+        """Run the queued rebuild; events arriving from here on queue a new one."""
+        with self._pending_lock:
+            self._refresh_pending = False
+        self._rebuild_menu()
 
     def _rebuild_menu(self):
-        """Rebuild the entire menu from the session store."""
+        """Sync the menu with the session store, touching only items that changed."""
         with self._refresh_lock:
+            # Nothing changed since the last render (e.g. menu re-opened)
+            version = self.store.version()
+            if version == self._rendered_version:
+                return
+            self._rendered_version = version
+
             sessions = self.store.get_all()
             count = len(sessions)
             has_unseen = self.store.has_unseen()
@@ -193,46 +690,40 @@ class TerminalFocusApp(rumps.App):
             else:
                 self.title = f"{ICON_NORMAL}{count}"
 
-            # Remove old session items
-            for key in self._session_keys:
-                try:
-                    del self.menu[key]
-                except KeyError:
-                    pass
-            self._session_keys = []
-
-            # Build new menu from scratch
-            self.menu.clear()
-
-            if not sessions:
-                item = rumps.MenuItem("No active terminals")
-                self.menu.add(item)
-                self._session_keys.append("No active terminals")
-            else:
-                for wid, info in sessions.items():
-                    label = f"{info['event_title']}"
-                    if info["event_msg"]:
-                        label += f" — {info['event_msg']}"
-
-                    if info["unseen"]:
-                        label = f"● {label}"
-
-                    item = rumps.MenuItem(label, callback=self._make_click_handler(wid))
-                    self.menu.add(item)
-                    self._session_keys.append(label)
-
-            # Add separator and quit
-            self.menu.add(rumps.separator)
-            self.menu.add(rumps.MenuItem("Quit", callback=self._quit))
-
-    def _make_click_handler(self, window_id):
-        """Create a click handler for a specific window."""
-        def handler(sender):
-            focus_terminal_window(window_id)
-            # Mark all as seen when user interacts
-            self.store.mark_all_seen()
-            self._rebuild_menu()
-        return handler
+            # Drop items for sessions that have gone away
+            for wid in self._items.keys() - sessions.keys():
+                del self.menu[_menu_key(wid)]
+                del self._wid_by_item_id[id(self._items.pop(wid))]
+
+            # Add new sessions, retitle changed ones in place
+            for wid, info in sessions.items():
+                label = _session_label(info)
+                item = self._items.get(wid)
+                if item is None:
+                    # Insert under a stable per-window key so the title can change freely
+                    item = rumps.MenuItem(_menu_key(wid), callback=self._on_click)
+                    self.menu.insert_before(MENU_SEPARATOR_KEY, item)
+                    self._items[wid] = item
+                    self._wid_by_item_id[id(item)] = wid
+                    item.title = label
+                elif item.title != label:
+                    item.title = label
+
+            # Placeholder only while there is nothing else to show
+            if sessions and MENU_PLACEHOLDER in self.menu:
+                del self.menu[MENU_PLACEHOLDER]
+            elif not sessions and MENU_PLACEHOLDER not in self.menu:
+                self.menu.insert_before(MENU_SEPARATOR_KEY, rumps.MenuItem(MENU_PLACEHOLDER))
+
+    def _on_click(self, sender):
+        """Shared click handler for session items; focuses the sender's window."""
+        window_id = self._wid_by_item_id.get(id(sender))
+        if window_id is None:
+            return
+        focus_terminal_window(window_id, self._focus_script)
+        # Mark all as seen when user interacts
+        self.store.mark_all_seen()
+        self._rebuild_menu()
 
     def _quit(self, sender):
         rumps.quit_application()
@@ -301,8 +792,8 @@ def main():
     app = TerminalFocusApp(store)
     EventHandler.app_ref = app
 
-    # Start HTTP server in background thread
-    server = HTTPServer(("127.0.0.1", port), EventHandler)
+    # Start the asyncio HTTP server on a background thread
+    server = EventServer(("127.0.0.1", port))
     server_thread = threading.Thread(target=server.serve_forever, daemon=True)
     server_thread.start()
     print(f"Terminal Focus listening on http://127.0.0.1:{port}")
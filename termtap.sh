@@ -67,19 +67,13 @@ else
 fi
 
 # --- Send the event via HTTP POST ---
-PAYLOAD=$(cat <<EOF
-{
-    "window_id": "$WINDOW_ID",
-    "event_title": "$EVENT_TITLE",
-    "event_msg": "$EVENT_MSG"
-}
-EOF
-)
-
+# Form-encoded rather than JSON: curl does the escaping, so quotes and
+# backslashes in the title/message can't break the payload.
 RESPONSE=$(curl -s -w "\n%{http_code}" -X POST \
     "http://${HOST}:${PORT}/" \
-    -H "Content-Type: application/json" \
-    -d "$PAYLOAD" 2>/dev/null) || {
+    --data-urlencode "window_id=${WINDOW_ID}" \
+    --data-urlencode "event_title=${EVENT_TITLE}" \
+    --data-urlencode "event_msg=${EVENT_MSG}" 2>/dev/null) || {
     echo "Error: Could not connect to Termtap app at ${HOST}:${PORT}." >&2
     echo "Is the app running? Start it with: termtap-server (or make run)" >&2
     exit 1
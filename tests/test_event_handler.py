@@ -1,15 +1,19 @@
 """Unit tests for the HTTP EventHandler."""
 
+import http.client
 import json
+import socket
 import threading
+import time
+from unittest.mock import MagicMock
 
 import pytest
 
-from http.server import HTTPServer
+from urllib.parse import urlencode
 from urllib.request import urlopen, Request
 from urllib.error import HTTPError
 
-from terminal_focus import SessionStore, EventHandler
+from terminal_focus import SessionStore, EventHandler, EventServer, handle_event
 
 
 @pytest.fixture
@@ -19,7 +23,7 @@ def server_and_store():
     EventHandler.store = store
     EventHandler.app_ref = None  # no menu bar app in tests
 
-    server = HTTPServer(("127.0.0.1", 0), EventHandler)  # port 0 = random free port
+    server = EventServer(("127.0.0.1", 0))  # port 0 = random free port
     port = server.server_address[1]
 
     thread = threading.Thread(target=server.serve_forever, daemon=True)
@@ -48,6 +52,21 @@ def _post(port, payload):
         return e.code, body
 
 
+def _post_form(port, fields):
+    """Send a form-encoded POST (as termtap.sh does) and return (status_code, response_body)."""
+    req = Request(
+        f"http://127.0.0.1:{port}/",
+        data=urlencode(fields).encode(),
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+        method="POST",
+    )
+    try:
+        with urlopen(req) as resp:
+            return resp.status, json.loads(resp.read().decode())
+    except HTTPError as e:
+        return e.code, json.loads(e.read().decode())
+
+
 class TestEventHandlerRegister:
     """Tests for registering sessions via HTTP."""
 
@@ -72,7 +91,7 @@ class TestEventHandlerRegister:
 
         assert store.count() == 1
         sessions = store.get_all()
-        assert sessions["12345"]["event_msg"] == "done"
+        assert sessions[12345]["event_msg"] == "done"
 
     def test_register_multiple_sessions(self, server_and_store):
         store, port = server_and_store
@@ -133,6 +152,33 @@ class TestEventHandlerValidation:
         assert status == 400
         assert "error" in body
 
+    def test_negative_window_id(self, server_and_store):
+        _, port = server_and_store
+
+        status, body = _post(port, {"window_id": "-5", "event_title": "build", "event_msg": ""})
+
+        assert status == 400
+        assert "numeric" in body["error"]
+
+    @pytest.mark.parametrize("window_id", [12.7, True, "1_000", "\u00b2", "9" * 5000])
+    def test_non_integer_window_id(self, server_and_store, window_id):
+        store, port = server_and_store
+
+        status, body = _post(port, {"window_id": window_id, "event_title": "build", "event_msg": ""})
+
+        assert status == 400
+        assert "numeric" in body["error"]
+        assert store.count() == 0
+
+    def test_string_and_int_window_ids_share_a_session(self, server_and_store):
+        store, port = server_and_store
+
+        _post(port, {"window_id": 12345, "event_title": "build", "event_msg": "a"})
+        _post_form(port, {"window_id": " 12345 ", "event_title": "build", "event_msg": "b"})
+
+        assert store.count() == 1
+        assert store.get_all()[12345]["event_msg"] == "b"
+
     def test_non_numeric_window_id(self, server_and_store):
         _, port = server_and_store
 
@@ -196,6 +242,61 @@ class TestEventHandlerValidation:
         assert status == 200
         assert store.count() == 1
 
+    def test_oversized_body_is_rejected_before_buffering(self, server_and_store):
+        store, port = server_and_store
+
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            # Announce a huge body but never send it: the reply must not wait for it
+            sock.sendall(b"POST / HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n")
+            sock.settimeout(5)
+            response = sock.makefile("rb").read()
+
+        assert response.startswith(b"HTTP/1.1 413 ")
+        assert store.count() == 0
+
+
+class TestEventHandlerFormEncoded:
+    """Tests for the form-encoded wire format used by termtap.sh."""
+
+    def test_register_via_form(self, server_and_store):
+        store, port = server_and_store
+
+        status, body = _post_form(port, {
+            "window_id": "12345",
+            "event_title": "build",
+            "event_msg": "42 tests passed ✅ \"quoted\"",
+        })
+
+        assert status == 200
+        assert body["status"] == "registered"
+        assert store.get_all()[12345]["event_msg"] == "42 tests passed ✅ \"quoted\""
+
+    def test_terminate_via_form(self, server_and_store):
+        store, port = server_and_store
+
+        _post_form(port, {"window_id": "12345", "event_title": "build", "event_msg": "started"})
+        status, body = _post_form(port, {"window_id": "12345", "event_title": "terminate", "event_msg": ""})
+
+        assert status == 200
+        assert body["status"] == "removed"
+        assert store.count() == 0
+
+    def test_form_empty_event_msg_is_allowed(self, server_and_store):
+        store, port = server_and_store
+
+        status, _ = _post_form(port, {"window_id": "12345", "event_title": "build", "event_msg": ""})
+
+        assert status == 200
+        assert store.get_all()[12345]["event_msg"] == ""
+
+    def test_form_non_numeric_window_id(self, server_and_store):
+        _, port = server_and_store
+
+        status, body = _post_form(port, {"window_id": "abc", "event_title": "build"})
+
+        assert status == 400
+        assert "numeric" in body["error"]
+
 
 class TestEventHandlerUnseenState:
     """Tests for unseen flag behavior through HTTP."""
@@ -216,3 +317,232 @@ class TestEventHandlerUnseenState:
 
         _post(port, {"window_id": 12345, "event_title": "build", "event_msg": "done"})
         assert store.has_unseen() is True
+
+
+class TestEventHandlerRefresh:
+    """Tests for when the menu bar app is asked to refresh."""
+
+    @pytest.fixture
+    def app(self, server_and_store):
+        EventHandler.app_ref = MagicMock()
+        yield EventHandler.app_ref
+        EventHandler.app_ref = None
+
+    def test_refresh_on_change(self, server_and_store, app):
+        _, port = server_and_store
+
+        _post(port, {"window_id": 1, "event_title": "build", "event_msg": "a"})
+        _post(port, {"window_id": 1, "event_title": "build", "event_msg": "b"})
+
+        assert app.schedule_refresh.call_count == 2
+
+    def test_duplicate_event_skips_refresh(self, server_and_store, app):
+        _, port = server_and_store
+
+        _post(port, {"window_id": 1, "event_title": "build", "event_msg": "a"})
+        status, body = _post(port, {"window_id": 1, "event_title": "build", "event_msg": "a"})
+
+        assert status == 200
+        assert body["status"] == "registered"
+        assert app.schedule_refresh.call_count == 1
+
+    def test_terminate_unknown_window_skips_refresh(self, server_and_store, app):
+        _, port = server_and_store
+
+        _post(port, {"window_id": 1, "event_title": "terminate", "event_msg": ""})
+
+        app.schedule_refresh.assert_not_called()
+
+
+class TestEventServerConcurrency:
+    """Tests for the single-threaded asyncio server under concurrent clients."""
+
+    def test_concurrent_posts(self, server_and_store):
+        store, port = server_and_store
+        results = []
+
+        def post_one(wid):
+            results.append(_post(port, {"window_id": wid, "event_title": "build", "event_msg": "x"}))
+
+        threads = [threading.Thread(target=post_one, args=(i,)) for i in range(1, 21)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(status == 200 for status, _ in results)
+        assert store.count() == 20
+
+    def test_non_post_method_is_rejected(self, server_and_store):
+        _, port = server_and_store
+
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/") as resp:
+                status = resp.status
+        except HTTPError as e:
+            status = e.code
+
+        assert status == 501
+
+    def test_request_split_across_packets(self, server_and_store):
+        store, port = server_and_store
+        body = b"window_id=12345&event_title=build&event_msg=started"
+        head = (
+            b"POST / HTTP/1.1\r\n"
+            b"Connection: close\r\n"
+            b"Content-Type: application/x-www-form-urlencoded\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n"
+        )
+
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            for chunk in (head[:10], head[10:], body[:7], body[7:]):
+                sock.sendall(chunk)
+                time.sleep(0.01)
+            response = sock.makefile("rb").read()
+
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert store.count() == 1
+
+    @pytest.mark.parametrize("header, status", [
+        (b"Transfer-Encoding: chunked", b"501 Not Implemented"),
+        (b"Expect: something-else", b"417 Expectation Failed"),
+    ])
+    def test_unsupported_framing_is_rejected(self, server_and_store, header, status):
+        store, port = server_and_store
+        request = (
+            b"POST / HTTP/1.1\r\n"
+            b"Content-Type: application/x-www-form-urlencoded\r\n"
+            + header + b"\r\n\r\n"
+            b"5\r\nhello\r\n0\r\n\r\n"
+        )
+
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(request)
+            sock.settimeout(5)
+            response = sock.makefile("rb").read()  # returns once the server closes
+
+        assert response.startswith(b"HTTP/1.1 " + status + b"\r\n")
+        assert response.count(b"HTTP/1.1 ") == 1  # leftover bytes are not parsed
+        assert b"Connection: close\r\n" in response
+        assert store.count() == 0
+
+    def test_expect_continue_gets_interim_response(self, server_and_store):
+        store, port = server_and_store
+        body = b"window_id=12345&event_title=build&event_msg=started"
+        head = (
+            b"POST / HTTP/1.1\r\n"
+            b"Connection: close\r\n"
+            b"Expect: 100-continue\r\n"
+            b"Content-Type: application/x-www-form-urlencoded\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n"
+        )
+
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(head)
+            # Body is only sent once the server asks for it
+            interim = sock.recv(1024)
+            sock.sendall(body)
+            response = sock.makefile("rb").read()
+
+        assert interim == b"HTTP/1.1 100 Continue\r\n\r\n"
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert store.count() == 1
+
+
+class TestHandleEvent:
+    """Tests for the transport-independent hot path."""
+
+    def test_returns_complete_response(self):
+        store = SessionStore()
+
+        response = handle_event(
+            b"window_id=12345&event_title=build&event_msg=started",
+            "application/x-www-form-urlencoded",
+            store,
+        )
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200 OK")
+        assert f"Content-Length: {len(body)}".encode() in head
+        assert json.loads(body) == {"status": "registered", "window_id": "12345"}
+        assert store.count() == 1
+
+    def test_invalid_json_response(self):
+        response = handle_event(b"{nope", "application/json", SessionStore())
+
+        assert response.startswith(b"HTTP/1.1 400 Bad Request")
+        assert b"Invalid JSON" in response
+
+
+class TestEventServerKeepAlive:
+    """Tests for HTTP/1.1 persistent connections."""
+
+    def test_connection_is_reused(self, server_and_store):
+        store, port = server_and_store
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        conn.request("POST", "/", body="window_id=1&event_title=build", headers=headers)
+        first = conn.getresponse()
+        first.read()
+        sock = conn.sock
+
+        conn.request("POST", "/", body="window_id=2&event_title=test", headers=headers)
+        second = conn.getresponse()
+        second.read()
+
+        assert first.status == second.status == 200
+        assert first.getheader("Connection") == "keep-alive"
+        assert conn.sock is sock  # no reconnect in between
+        assert store.count() == 2
+        conn.close()
+
+    def test_pipelined_requests(self, server_and_store):
+        store, port = server_and_store
+
+        def request(body, close=False):
+            return (
+                b"POST / HTTP/1.1\r\n"
+                + (b"Connection: close\r\n" if close else b"")
+                + b"Content-Type: application/x-www-form-urlencoded\r\n"
+                + b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n"
+                + body
+            )
+
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(
+                request(b"window_id=1&event_title=a")
+                + request(b"window_id=2&event_title=b")
+                + request(b"window_id=3&event_title=c", close=True)
+            )
+            sock.settimeout(5)
+            response = sock.makefile("rb").read()
+
+        assert response.count(b"HTTP/1.1 200 OK\r\n") == 3
+        assert store.count() == 3
+
+    def test_request_larger_than_receive_buffer(self, server_and_store):
+        store, port = server_and_store
+        msg = "x" * 10000  # well past RECV_BUFFER_BYTES
+
+        status, _ = _post_form(port, {"window_id": "1", "event_title": "build", "event_msg": msg})
+
+        assert status == 200
+        assert store.get_all()[1]["event_msg"] == msg
+
+    def test_shutdown_closes_idle_connections(self):
+        EventHandler.store = SessionStore()
+        server = EventServer(("127.0.0.1", 0))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        conn = http.client.HTTPConnection(*server.server_address)
+        conn.request("POST", "/", body=json.dumps({"window_id": 1, "event_title": "a"}))
+        conn.getresponse().read()
+
+        # An idle keep-alive client must not hold up shutdown until it times out
+        started = time.monotonic()
+        server.shutdown()
+        assert time.monotonic() - started < 5
+        conn.close()
@@ -1,10 +1,19 @@
 """Unit tests for focus_terminal_window (mocked)."""
 
-from unittest.mock import patch, call
+import os
+import subprocess
+from unittest.mock import patch, call, MagicMock
 
 import pytest
 
-from terminal_focus import focus_terminal_window
+from terminal_focus import FOCUS_SCRIPT_SOURCE, focus_terminal_window, compiled_focus_script, FocusScript
+
+
+@pytest.fixture(autouse=True)
+def no_compiled_script():
+    """Exercise the plain `osascript -e` path unless a test opts into the compiled one."""
+    with patch("terminal_focus.compiled_focus_script", return_value=None):
+        yield
 
 
 class TestFocusTerminalWindow:
@@ -12,44 +21,166 @@ class TestFocusTerminalWindow:
 
     @patch("terminal_focus.subprocess.run")
     def test_calls_osascript(self, mock_run):
-        focus_terminal_window("12345")
+        focus_terminal_window(12345)
 
         mock_run.assert_called_once()
         args = mock_run.call_args
         assert args[0][0][0] == "osascript"
         assert args[0][0][1] == "-e"
-        assert "12345" in args[0][0][2]
+        assert args[0][0][3] == "12345"
 
     @patch("terminal_focus.subprocess.run")
-    def test_script_contains_window_id(self, mock_run):
-        focus_terminal_window("67890")
+    def test_window_id_is_passed_as_argv(self, mock_run):
+        focus_terminal_window(67890)
 
         script = mock_run.call_args[0][0][2]
-        assert "67890" in script
+        assert mock_run.call_args[0][0][3] == "67890"
+        assert "on run argv" in script
         assert "Terminal" in script
         assert "activate" in script
 
     @patch("terminal_focus.subprocess.run")
     def test_script_sets_window_index(self, mock_run):
-        focus_terminal_window("12345")
+        focus_terminal_window(12345)
 
         script = mock_run.call_args[0][0][2]
-        assert "set index" in script
-        assert "set targetWindow" in script
+        assert "set index of window id targetId to 1" in script
+        assert "exists window id targetId" in script
 
     @patch("terminal_focus.subprocess.run")
     def test_timeout_is_set(self, mock_run):
-        focus_terminal_window("12345")
+        focus_terminal_window(12345)
 
         kwargs = mock_run.call_args[1]
         assert kwargs.get("timeout") == 5
 
+    def test_script_bounds_apple_events(self):
+        # The in-process path has no subprocess timeout; the script carries its own
+        assert "with timeout of 5 seconds" in FOCUS_SCRIPT_SOURCE
+        assert "end timeout" in FOCUS_SCRIPT_SOURCE
+
     @patch("terminal_focus.subprocess.run", side_effect=Exception("osascript failed"))
     def test_exception_is_suppressed(self, mock_run):
         # Should not raise
-        focus_terminal_window("12345")
+        focus_terminal_window(12345)
 
     @patch("terminal_focus.subprocess.run", side_effect=__import__("subprocess").TimeoutExpired(cmd="osascript", timeout=5))
     def test_timeout_is_suppressed(self, mock_run):
         # Should not raise
-        focus_terminal_window("12345")
+        focus_terminal_window(12345)
+
+
+class TestFocusScript:
+    """Tests for the in-process NSAppleScript path (mocked)."""
+
+    @pytest.fixture
+    def ns(self):
+        """Patch the PyObjC classes; yields (NSAppleScript, NSAppleEventDescriptor, compiled script)."""
+        ns_script = MagicMock()
+        ns_descriptor = MagicMock()
+        script = ns_script.alloc.return_value.initWithSource_.return_value
+        script.compileAndReturnError_.return_value = (True, None)
+        script.executeAppleEvent_error_.return_value = (MagicMock(), None)
+        with patch("terminal_focus.NSAppleScript", ns_script), \
+                patch("terminal_focus.NSAppleEventDescriptor", ns_descriptor):
+            yield ns_script, ns_descriptor, script
+
+    def test_compiles_once(self, ns):
+        _, _, script = ns
+        focus = FocusScript()
+        focus.focus(1)
+        focus.focus(2)
+
+        script.compileAndReturnError_.assert_called_once()
+        assert script.executeAppleEvent_error_.call_count == 2
+
+    def test_compile_error_raises(self, ns):
+        _, _, script = ns
+        script.compileAndReturnError_.return_value = (False, {"NSAppleScriptErrorMessage": "boom"})
+
+        with pytest.raises(RuntimeError):
+            FocusScript()
+
+    def test_calls_focus_window_handler_with_id(self, ns):
+        _, descriptor, _ = ns
+
+        assert FocusScript().focus(12345) is True
+
+        descriptor.descriptorWithInt32_.assert_called_once_with(12345)
+        descriptor.descriptorWithString_.assert_called_once_with("focus_window")
+
+    def test_execution_error_returns_false(self, ns):
+        _, _, script = ns
+        script.executeAppleEvent_error_.return_value = (None, {"NSAppleScriptErrorNumber": -1728})
+
+        assert FocusScript().focus(12345) is False
+
+    @patch("terminal_focus.subprocess.run")
+    def test_focus_skips_osascript_when_in_process_succeeds(self, mock_run):
+        script = MagicMock()
+        script.focus.return_value = True
+
+        focus_terminal_window(12345, script)
+
+        script.focus.assert_called_once_with(12345)
+        mock_run.assert_not_called()
+
+    @patch("terminal_focus.subprocess.run")
+    def test_focus_falls_back_when_in_process_fails(self, mock_run):
+        script = MagicMock()
+        script.focus.return_value = False
+
+        focus_terminal_window(12345, script)
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][-1] == "12345"
+
+
+def _fake_osacompile(args, **kwargs):
+    """Stand-in for subprocess.run(["osacompile", "-o", path, ...]) that writes the output file."""
+    open(args[2], "wb").close()
+    return subprocess.CompletedProcess(args, 0)
+
+
+class TestCompiledFocusScript:
+    """Tests for the precompiled .scpt fallback path (mocked)."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path):
+        compiled_focus_script.cache_clear()
+        with patch("terminal_focus.SCRIPT_CACHE_DIR", str(tmp_path)):
+            yield tmp_path
+        compiled_focus_script.cache_clear()
+
+    @patch("terminal_focus.subprocess.run", side_effect=_fake_osacompile)
+    def test_compiles_once_with_osacompile(self, mock_run, cache_dir):
+        path = compiled_focus_script()
+        assert compiled_focus_script() == path
+
+        mock_run.assert_called_once()
+        args = mock_run.call_args[0][0]
+        assert args[0] == "osacompile"
+        assert "on run argv" in args[-1]
+        assert os.path.dirname(path) == str(cache_dir)
+        assert path.endswith(".scpt")
+
+    @patch("terminal_focus.subprocess.run", side_effect=_fake_osacompile)
+    def test_reuses_cached_file(self, mock_run, cache_dir):
+        path = compiled_focus_script()
+        compiled_focus_script.cache_clear()
+        mock_run.reset_mock()
+
+        assert compiled_focus_script() == path
+        mock_run.assert_not_called()
+
+    @patch("terminal_focus.subprocess.run", side_effect=FileNotFoundError("osacompile"))
+    def test_returns_none_without_osacompile(self, mock_run):
+        assert compiled_focus_script() is None
+
+    @patch("terminal_focus.subprocess.run")
+    def test_focus_runs_compiled_script(self, mock_run):
+        with patch("terminal_focus.compiled_focus_script", return_value="/cache/focus.scpt"):
+            focus_terminal_window(12345)
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ["osascript", "/cache/focus.scpt", "12345"]
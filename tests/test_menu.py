@@ -0,0 +1,152 @@
+"""Unit tests for the incremental menu rebuild (rumps mocked)."""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class _FakeMenuItem:
+    def __init__(self, title, callback=None):
+        self.title = title
+        self.callback = callback
+
+
+class _FakeMenu(dict):
+    """Ordered like rumps.Menu: items stay under the key they were added with."""
+
+    def add(self, item):
+        self[item.title] = item
+
+    def insert_before(self, existing_key, item):
+        assert item.title not in self, f"duplicate menu key {item.title!r}"
+        entries = list(self.items())
+        self.clear()
+        for key, value in entries:
+            if key == existing_key:
+                self[item.title] = item
+            self[key] = value
+
+
+class _FakeApp:
+    def __init__(self, title, quit_button=None):
+        self.title = title
+        self.menu = _FakeMenu()
+
+
+@pytest.fixture(scope="module")
+def tf():
+    """A private copy of terminal_focus built against a fake rumps."""
+    rumps = types.ModuleType("rumps")
+    rumps.App = _FakeApp
+    rumps.MenuItem = _FakeMenuItem
+    rumps.separator = object()
+    rumps.quit_application = MagicMock()
+
+    path = Path(__file__).resolve().parent.parent / "terminal_focus.py"
+    spec = importlib.util.spec_from_file_location("terminal_focus_menu_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {"rumps": rumps}):
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def app(tf):
+    with patch.object(tf, "FocusScript", side_effect=RuntimeError("no AppleScript")), \
+            patch.object(tf, "AppHelper") as app_helper:
+        # Run debounced rebuilds immediately
+        app_helper.callLater.side_effect = lambda delay, fn, *a: fn(*a)
+        yield tf.TerminalFocusApp(tf.SessionStore())
+
+
+def _session_items(tf, app):
+    return {key: item for key, item in app.menu.items() if key.startswith("session:")}
+
+
+class TestMenuRebuild:
+    """Tests for syncing menu items with the session store."""
+
+    def test_starts_with_placeholder(self, tf, app):
+        assert tf.MENU_PLACEHOLDER in app.menu
+        assert _session_items(tf, app) == {}
+
+    def test_add_session(self, tf, app):
+        app.store.upsert(1, "build", "started")
+        app.schedule_refresh()
+
+        items = _session_items(tf, app)
+        assert list(items) == ["session:1"]
+        assert items["session:1"].title == "● build — started"
+        assert tf.MENU_PLACEHOLDER not in app.menu
+        assert app.title == f"{tf.ICON_UNSEEN}1"
+        # Session items sit above the separator and Quit
+        assert list(app.menu)[-2:] == [tf.MENU_SEPARATOR_KEY, "Quit"]
+
+    def test_changed_message_retitles_in_place(self, tf, app):
+        app.store.upsert(1, "build", "started")
+        app.schedule_refresh()
+        item = app.menu["session:1"]
+
+        app.store.upsert(1, "build", "done")
+        app.schedule_refresh()
+
+        assert app.menu["session:1"] is item
+        assert item.title == "● build — done"
+
+    def test_repeated_events_never_create_a_second_item(self, tf, app):
+        for msg in ("started", "started", "running", "done"):
+            app.store.upsert(7, "build", msg)
+            app.schedule_refresh()
+        app.store.mark_all_seen()
+        app._rebuild_menu()
+
+        assert len(_session_items(tf, app)) == 1
+        assert app.menu["session:7"].title == "build — done"
+        assert len(app._wid_by_item_id) == 1
+
+    def test_removing_last_session_restores_placeholder(self, tf, app):
+        app.store.upsert(1, "build", "")
+        app.schedule_refresh()
+
+        app.store.remove(1)
+        app.schedule_refresh()
+
+        assert _session_items(tf, app) == {}
+        assert tf.MENU_PLACEHOLDER in app.menu
+        assert app.title == f"{tf.ICON_NORMAL}0"
+
+
+class TestMenuClick:
+    """Tests for the shared session click handler."""
+
+    def test_click_focuses_the_items_window(self, tf, app):
+        app.store.upsert(1, "build", "")
+        app.store.upsert(2, "test", "")
+        app.schedule_refresh()
+
+        with patch.object(tf, "focus_terminal_window") as focus:
+            item = app.menu["session:2"]
+            item.callback(item)
+
+        focus.assert_called_once_with(2, app._focus_script)
+        assert app.store.has_unseen() is False
+        assert app.menu["session:2"].title == "test"
+
+    def test_removed_item_leaves_no_click_mapping(self, tf, app):
+        app.store.upsert(1, "build", "")
+        app.store.upsert(2, "test", "")
+        app.schedule_refresh()
+        removed = app.menu["session:1"]
+
+        app.store.remove(1)
+        app.schedule_refresh()
+
+        assert set(app._wid_by_item_id.values()) == {2}
+        assert id(removed) not in app._wid_by_item_id
+        with patch.object(tf, "focus_terminal_window") as focus:
+            app._on_click(removed)
+        focus.assert_not_called()
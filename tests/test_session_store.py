@@ -12,65 +12,98 @@ class TestSessionStoreUpsert:
 
     def test_upsert_adds_new_session(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
+        store.upsert(123, "build", "started")
 
         sessions = store.get_all()
-        assert "123" in sessions
-        assert sessions["123"]["event_title"] == "build"
-        assert sessions["123"]["event_msg"] == "started"
-        assert sessions["123"]["unseen"] is True
+        assert 123 in sessions
+        assert sessions[123]["event_title"] == "build"
+        assert sessions[123]["event_msg"] == "started"
+        assert sessions[123]["unseen"] is True
 
     def test_upsert_updates_existing_session(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
-        store.upsert("123", "build", "completed")
+        store.upsert(123, "build", "started")
+        store.upsert(123, "build", "completed")
 
         sessions = store.get_all()
         assert len(sessions) == 1
-        assert sessions["123"]["event_msg"] == "completed"
-        assert sessions["123"]["unseen"] is True
+        assert sessions[123]["event_msg"] == "completed"
+        assert sessions[123]["unseen"] is True
 
     def test_upsert_multiple_sessions(self):
         store = SessionStore()
-        store.upsert("100", "build", "started")
-        store.upsert("200", "deploy", "staging")
-        store.upsert("300", "test", "running")
+        store.upsert(100, "build", "started")
+        store.upsert(200, "deploy", "staging")
+        store.upsert(300, "test", "running")
 
         assert store.count() == 3
 
     def test_upsert_marks_unseen_after_mark_all_seen(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
+        store.upsert(123, "build", "started")
         store.mark_all_seen()
         assert store.has_unseen() is False
 
-        store.upsert("123", "build", "done")
+        store.upsert(123, "build", "done")
         assert store.has_unseen() is True
 
 
+class TestSessionStoreDuplicates:
+    """Tests for ignoring resends of an unchanged, still-unseen event."""
+
+    def test_duplicate_unseen_upsert_is_noop(self):
+        store = SessionStore()
+        assert store.upsert(123, "build", "started") is True
+        v = store.version()
+
+        assert store.upsert(123, "build", "started") is False
+        assert store.version() == v
+
+    def test_duplicate_after_seen_marks_unseen_again(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+        store.mark_all_seen()
+
+        assert store.upsert(123, "build", "started") is True
+        assert store.has_unseen() is True
+
+    def test_changed_message_is_not_a_duplicate(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+
+        assert store.upsert(123, "build", "done") is True
+
+    def test_remove_reports_whether_session_existed(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+
+        assert store.remove(123) is True
+        assert store.remove(123) is False
+
+
 class TestSessionStoreRemove:
     """Tests for removing sessions."""
 
     def test_remove_existing_session(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
-        store.remove("123")
+        store.upsert(123, "build", "started")
+        store.remove(123)
 
         assert store.count() == 0
-        assert "123" not in store.get_all()
+        assert 123 not in store.get_all()
 
     def test_remove_nonexistent_session_is_noop(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
-        store.remove("999")  # should not raise
+        store.upsert(123, "build", "started")
+        store.remove(999)  # should not raise
 
         assert store.count() == 1
 
     def test_double_remove_is_noop(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
-        store.remove("123")
-        store.remove("123")  # should not raise
+        store.upsert(123, "build", "started")
+        store.remove(123)
+        store.remove(123)  # should not raise
 
         assert store.count() == 0
 
@@ -80,8 +113,8 @@ class TestSessionStoreMarkAllSeen:
 
     def test_mark_all_seen(self):
         store = SessionStore()
-        store.upsert("100", "build", "started")
-        store.upsert("200", "deploy", "staging")
+        store.upsert(100, "build", "started")
+        store.upsert(200, "deploy", "staging")
 
         assert store.has_unseen() is True
 
@@ -107,22 +140,67 @@ class TestSessionStoreHasUnseen:
 
     def test_has_unseen_after_upsert(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
+        store.upsert(123, "build", "started")
         assert store.has_unseen() is True
 
     def test_partial_unseen(self):
         store = SessionStore()
-        store.upsert("100", "build", "started")
-        store.upsert("200", "deploy", "staging")
+        store.upsert(100, "build", "started")
+        store.upsert(200, "deploy", "staging")
         store.mark_all_seen()
 
         # Only update one session
-        store.upsert("100", "build", "done")
+        store.upsert(100, "build", "done")
 
         assert store.has_unseen() is True
         sessions = store.get_all()
-        assert sessions["100"]["unseen"] is True
-        assert sessions["200"]["unseen"] is False
+        assert sessions[100]["unseen"] is True
+        assert sessions[200]["unseen"] is False
+
+
+class TestSessionStoreEpochs:
+    """Tests for epoch-based seen tracking across removals."""
+
+    def test_removing_newest_unseen_session_clears_unseen(self):
+        store = SessionStore()
+        store.upsert(100, "build", "started")
+        store.mark_all_seen()
+        store.upsert(200, "deploy", "staging")
+
+        store.remove(200)
+
+        assert store.has_unseen() is False
+
+    def test_removing_newest_keeps_older_unseen(self):
+        store = SessionStore()
+        store.upsert(100, "build", "started")
+        store.upsert(200, "deploy", "staging")
+
+        store.remove(200)
+
+        assert store.has_unseen() is True
+        assert store.get_all()[100]["unseen"] is True
+
+    def test_removing_older_session_keeps_newest_unseen(self):
+        store = SessionStore()
+        store.upsert(100, "build", "started")
+        store.mark_all_seen()
+        store.upsert(200, "deploy", "staging")
+
+        store.remove(100)
+
+        assert store.has_unseen() is True
+
+    def test_readd_after_remove_is_unseen(self):
+        store = SessionStore()
+        store.upsert(100, "build", "started")
+        store.mark_all_seen()
+        store.remove(100)
+
+        store.upsert(100, "build", "started")
+
+        assert store.has_unseen() is True
+        assert store.get_all()[100]["unseen"] is True
 
 
 class TestSessionStoreCount:
@@ -134,30 +212,89 @@ class TestSessionStoreCount:
 
     def test_count_after_upserts(self):
         store = SessionStore()
-        store.upsert("100", "a", "b")
-        store.upsert("200", "c", "d")
+        store.upsert(100, "a", "b")
+        store.upsert(200, "c", "d")
         assert store.count() == 2
 
     def test_count_after_remove(self):
         store = SessionStore()
-        store.upsert("100", "a", "b")
-        store.upsert("200", "c", "d")
-        store.remove("100")
+        store.upsert(100, "a", "b")
+        store.upsert(200, "c", "d")
+        store.remove(100)
         assert store.count() == 1
 
 
 class TestSessionStoreGetAll:
     """Tests for get_all snapshot behavior."""
 
-    def test_get_all_returns_copy(self):
+    def test_get_all_is_read_only(self):
         store = SessionStore()
-        store.upsert("123", "build", "started")
+        store.upsert(123, "build", "started")
 
         snapshot = store.get_all()
-        snapshot["123"]["event_msg"] = "MODIFIED"
+        with pytest.raises(TypeError):
+            snapshot[123]["event_msg"] = "MODIFIED"
+        with pytest.raises(TypeError):
+            snapshot[999] = {}
 
         # Original should be unchanged
-        assert store.get_all()["123"]["event_msg"] == "started"
+        assert store.get_all()[123]["event_msg"] == "started"
+
+    def test_get_all_records_unpack_in_field_order(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+
+        title, msg, unseen = store.get_all()[123]
+        assert (title, msg, unseen) == ("build", "started", True)
+
+    def test_get_all_reuses_snapshot_when_unchanged(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+
+        assert store.get_all() is store.get_all()
+
+    def test_get_all_refreshes_after_change(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+        before = store.get_all()
+
+        store.upsert(123, "build", "done")
+        after = store.get_all()
+
+        assert after is not before
+        assert before[123]["event_msg"] == "started"
+        assert after[123]["event_msg"] == "done"
+
+
+class TestSessionStoreVersion:
+    """Tests for the change counter."""
+
+    def test_version_bumps_on_upsert_and_remove(self):
+        store = SessionStore()
+        v0 = store.version()
+        store.upsert(123, "build", "started")
+        v1 = store.version()
+        store.remove(123)
+        v2 = store.version()
+
+        assert v0 != v1 != v2
+
+    def test_version_unchanged_by_noop_remove(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+        v = store.version()
+        store.remove(999)
+
+        assert store.version() == v
+
+    def test_version_unchanged_by_redundant_mark_all_seen(self):
+        store = SessionStore()
+        store.upsert(123, "build", "started")
+        store.mark_all_seen()
+        v = store.version()
+        store.mark_all_seen()
+
+        assert store.version() == v
 
 
 class TestSessionStoreThreadSafety:
@@ -170,7 +307,7 @@ class TestSessionStoreThreadSafety:
         def upsert_many(start_id, count):
             try:
                 for i in range(count):
-                    store.upsert(str(start_id + i), "event", f"msg-{i}")
+                    store.upsert(start_id + i, "event", f"msg-{i}")
             except Exception as e:
                 errors.append(e)
 
@@ -194,14 +331,14 @@ class TestSessionStoreThreadSafety:
         def upsert_loop():
             try:
                 for i in range(100):
-                    store.upsert(str(i), "event", f"msg-{i}")
+                    store.upsert(i, "event", f"msg-{i}")
             except Exception as e:
                 errors.append(e)
 
         def remove_loop():
             try:
                 for i in range(100):
-                    store.remove(str(i))
+                    store.remove(i)
             except Exception as e:
                 errors.append(e)
 